@@ -1,9 +1,10 @@
 from re import compile as re_compile
 from operator import attrgetter
 from ast import literal_eval
-from struct import unpack_from
+from struct import Struct
 
-from .points import holes_by_width, point, find_first_edge, find_edges
+from .points import (holes_by_width, point, find_first_edge, find_edges,
+                     find_edges_multi)
 from .rsdicomread import read_dataset
 from .case_comment_data import get_case_comment_data, set_case_comment_data
 
@@ -18,18 +19,22 @@ CT_Couch_TopY = 20.8
 CT_Top_NegativeX = -24.5
 HN_SEARCH_DELTA = -1.
 
-HN_SITES = {"Brain",
-            "Head & Neck"}
+HN_SITES = frozenset({"Brain",
+                      "Head & Neck"})
 
-NON_HN_SITES = {"Left Breast",
-                "Right Breast",
-                "Thorax",
-                "Abdomen",
-                "Pelvis",
-                "Left Upper Extremity",
-                "Right Upper Extremity",
-                "Left Lower Extremity",
-                "Right Lower Extremity"}
+NON_HN_SITES = frozenset({"Left Breast",
+                          "Right Breast",
+                          "Thorax",
+                          "Abdomen",
+                          "Pelvis",
+                          "Left Upper Extremity",
+                          "Right Upper Extremity",
+                          "Left Lower Extremity",
+                          "Right Lower Extremity"})
+
+# Site -> isHN lookup for test_for_hn.
+_SITE_HN_MAP = {**{site: True for site in HN_SITES},
+                **{site: False for site in NON_HN_SITES}}
 
 SITE_SHIFT = {"Left Breast": 15.,
               "Right Breast": 15.,
@@ -52,29 +57,34 @@ MACHINE_SEARCHES = {'Edge':     [['brain', False],  # Brain usually on Edge
                                  ['extremity', True],
                                  ['whole', True]]}  # Whole brain on TB
 
+# Flattened (machine, substring, definitive) search order for guess_machine.
+_MACHINE_SEARCH_ORDER = tuple((mach, s, definitive)
+                              for mach, strings in MACHINE_SEARCHES.items()
+                              for s, definitive in strings)
+
 PATIENT_ORIENTATIONS = {'TrueBeam': ['FFS']}
 
 DEFAULT_MACHINE = 'TrueBeam'
 
 # Tabletops of known offsets.  Surface ROI is the roi whose upper surface is
 # at the height of the CT tabletop.  ROI_Names will be completed when brought
-# into the collection.
+# into the collection.  Offsets are built as points once here.
 KNOWN_TOPS = {
     'TrueBeam Couch Model':
         {'Surface_ROI': 'Surface Shell - TrueBeam',
-         'Top_offset': {'x': 0., 'y': 0., 'z': 0.},
+         'Top_offset': point(x=0., y=0., z=0.),
          'Tx_Machines': 'TrueBeam'},
     'Edge Couch Model':
         {'Surface_ROI': 'Outer Shell - Edge',
-         'Top_offset': {'x': 0., 'y': 0., 'z': 0.},
+         'Top_offset': point(x=0., y=0., z=0.),
          'Tx_Machines': 'Edge'},
     'Edge Head & Neck Model':
         {'Surface_ROI': 'Outer Shell - Edge H&N',
-         'Top_offset': {'x': -.1, 'y': -2.33, 'z': 0.4},
+         'Top_offset': point(x=-.1, y=-2.33, z=0.4),
          'Tx_Machines': 'Edge'},
     'TrueBeam Head & Neck Model':
         {'Surface_ROI': 'Surface Shell - TrueBeam',
-         'Top_offset': {'x': 0.15, 'y': 0., 'z': 0.4},
+         'Top_offset': point(x=0.15, y=0., z=0.4),
          'Tx_Machines': 'TrueBeam'}
 }
 
@@ -101,6 +111,10 @@ HN_H3_X = 11.6
 HN_H_DIAM = 3.4
 HN_H1_TO_BOARD_Z = 0.85
 
+# X positions of the side holes (top positive, top negative, bottom positive,
+# bottom negative) relative to the center of the board.
+HN_SIDE_HOLES_X = (HN_H2_X, -HN_H2_X, HN_H3_X, -HN_H3_X)
+
 
 # For couch height, appears to always have tabletop at 208mm (-20.8 in RS)
 #  Possible tag of interest might include 01F1,100C to correct for image
@@ -133,21 +147,45 @@ struct DCM_TAG_01F7_1027
 
 # DICOM Search
 PRIV_01F7_1027 = (0x01F7, 0x1027)
+# Leading double (CouchLong) of the struct above.
+_COUCH_LONG_STRUCT = Struct('<d')
 HEURISTIC_OFFSET = 1500
 
+# Identity transform, translation terms are filled in by get_transform.
+_IDENTITY_TRANSFORM = {'M11': 1., 'M12': 0., 'M13': 0., 'M14': 0.,
+                       'M21': 0., 'M22': 1., 'M23': 0., 'M24': 0.,
+                       'M31': 0., 'M32': 0., 'M33': 1., 'M34': 0.,
+                       'M41': 0., 'M42': 0., 'M43': 0., 'M44': 1.}
+
+# Successful results of guess_couchtop_z keyed by str(img_stack), so the DICOM
+# data is only parsed once per image stack.  Failures are not cached so they
+# can be retried.
+_COUCHTOP_Z_CACHE = {}
+
 
 def guess_couchtop_z(img_stack):
     """
     Guesses the z coordinate of the couch top based on specific dicom tags.
     Tags don't currently populate correctly, so work on reading them by hand.
     """
+    key = str(img_stack)
+    if key in _COUCHTOP_Z_CACHE:
+        return _COUCHTOP_Z_CACHE[key]
+
+    couch_z = _read_couchtop_z(img_stack)
+    if couch_z is not None:
+        _COUCHTOP_Z_CACHE[key] = couch_z
+    return couch_z
+
+
+def _read_couchtop_z(img_stack):
     try:
 
         img, = read_dataset(img_stack)
 
         CZ_raw = img[PRIV_01F7_1027].value
 
-        couchZabs = unpack_from("f", CZ_raw)[0]
+        couchZabs, = _COUCH_LONG_STRUCT.unpack_from(CZ_raw)
         sliceloc = img.SliceLocation.real
         ipp = img.ImagePositionPatient[2].real
 
@@ -163,21 +201,32 @@ def guess_couchtop_z(img_stack):
         return None
 
 
-def guess_machine(icase):
+def case_search_text(icase):
+    """
+    Case-folded text from the case used by guess_machine.  Can be computed
+        once and passed to guess_machine when guessing repeatedly for the same
+        case.
+    """
+    return (icase.BodySite + icase.CaseName + icase.Diagnosis).casefold()
+
+
+def guess_machine(icase, snd=None):
     """
     Guess the machine based on the icase.BodySite.  Since we usually only get
         to this when we don't have a plan, only try to used values present in
         the case (BodySite, CaseName, Diagnosis, Comments?)
+    snd can be given as the result of case_search_text(icase) to avoid
+        fetching and folding the case strings again.
     """
-    snd = (icase.BodySite + icase.CaseName + icase.Diagnosis).lower()
+    if snd is None:
+        snd = case_search_text(icase)
     machine = DEFAULT_MACHINE
-    for mach, strings in MACHINE_SEARCHES.items():
-        for s in strings:
-            if s[0] in snd:
-                if s[1]:  # If we have a definitive answer, return now
-                    return mach
-                else:  # Answer might be overriden later, set and continue
-                    machine = mach
+    for mach, s, definitive in _MACHINE_SEARCH_ORDER:
+        if s in snd:
+            if definitive:  # If we have a definitive answer, return now
+                return mach
+            else:  # Answer might be overriden later, set and continue
+                machine = mach
     # TODO: Prompt for machine if we can't figure it out
     return machine
 
@@ -190,16 +239,16 @@ def test_for_hn(icase, img_stack):
         position.
         Also test for patient orientation.  If FFS, assume it isn't H&N.
     """
-    if icase.BodySite in HN_SITES:
-        return True
-    elif icase.BodySite in NON_HN_SITES:
-        return False
-    else:
-        # More complicated, need to test if there is a HN board.
-        # For now, warn using warnings
-        _logger.warning("Testing for H&N board by searching image is not "
-                       f"implemented yet.  Treatment Site {icase.BodySite} "
-                       "is insufficient for use in determination.")
+    body_site = icase.BodySite
+    is_hn = _SITE_HN_MAP.get(body_site)
+    if is_hn is not None:
+        return is_hn
+
+    # More complicated, need to test if there is a HN board.
+    # For now, warn using warnings
+    _logger.warning("Testing for H&N board by searching image is not "
+                    f"implemented yet.  Treatment Site {body_site} "
+                    "is insufficient for use in determination.")
     return False
 
 
@@ -241,7 +290,8 @@ def find_table_height(img_stack, resolution=None, search_start=None,
 class CouchTop(object):
     Name = ""
 
-    ROI_Names = None
+    ROI_Names = frozenset()
+    _roi_names_list = ()
     Top_offset = None  # {'x': 0., 'y': 0., 'z': '0.'},
     Tx_Machines = None
     _tx_machines_set = None
@@ -262,19 +312,23 @@ class CouchTop(object):
     def __init__(self, Name, Top_offset=None, Surface_ROI="", Tx_Machines="",
                  patient_db=get_current("PatientDB"), structure_set=None):
         self.Name = Name
-        _logger.debug(f"Building CouchTop with: {Name}, {Top_offset}, "
-                     f"{Surface_ROI}, {Tx_Machines}")
+        _logger.debug("Building CouchTop with: %s, %s, %s, %s",
+                      Name, Top_offset, Surface_ROI, Tx_Machines)
 
         try:
             self.template = patient_db.LoadTemplatePatientModel(
                 templateName=Name, lockMode='Read')
 
             rois = self.template.PatientModel.RegionsOfInterest
-            self.ROI_Names = {roi.Name for roi in rois}
+            # Keep an ordered tuple for iterating/passing to RS and a
+            # frozenset for membership tests.
+            self._roi_names_list = tuple(roi.Name for roi in rois)
+            self.ROI_Names = frozenset(self._roi_names_list)
 
             self._build_from_description()
 
-            self._Top_offset = Top_offset if Top_offset else self._Top_offset
+            self._Top_offset = (point(Top_offset) if Top_offset
+                                else self._Top_offset)
             self.Surface_ROI = Surface_ROI if Surface_ROI else self.Surface_ROI
             self.isHN = True if "H&N" in "".join(self.ROI_Names) else False
             self.Tx_Machines = Tx_Machines if Tx_Machines else self.Tx_Machines
@@ -320,9 +374,9 @@ class CouchTop(object):
         try:
             surf_bb = self._surfaceboundingbox
             x_offset = (surf_bb[0].x + surf_bb[1].x) / 2.
-            return point(x=-x_offset+self._Top_offset['x'],
-                         y=self._Top_offset['y'],
-                         z=self._Top_offset['z'])
+            return point(x=-x_offset+self._Top_offset.x,
+                         y=self._Top_offset.y,
+                         z=self._Top_offset.z)
         except Exception as e:
             _logger.info(str(e), exc_info=True)
             return self._Top_offset
@@ -336,16 +390,15 @@ class CouchTop(object):
         current_y = self._surfaceboundingbox[0].y
 
         y = couch_y - current_y
-        pt = point(x=0, y=y, z=z) + self.Top_offset
-        transform = {'M11': 1, 'M12': 0, 'M13': 0, 'M14': pt.x,
-                     'M21': 0, 'M22': 1, 'M23': 0, 'M24': pt.y,
-                     'M31': 0, 'M32': 0, 'M33': 1, 'M34': pt.z,
-                     'M41': 0, 'M42': 0, 'M43': 0, 'M44': 1}
+        offset = self.Top_offset
 
         # Ensure that transform is a valid matrix of floats as RS will crash if
         # there are nonetypes or anything else in here.
-        transform = {k: float(v) for k, v in transform.items()}
-        _logger.debug(f'{transform}')
+        transform = {**_IDENTITY_TRANSFORM,
+                     'M14': float(offset.x),
+                     'M24': float(y + offset.y),
+                     'M34': float(z + offset.z)}
+        _logger.debug('%s', transform)
         return transform
 
     def add_to_case(self, icase=None, structure_set=None,
@@ -368,7 +421,7 @@ class CouchTop(object):
             csft = icase.PatientModel.CreateStructuresFromTemplate
             csft(SourceTemplate=self.template,
                  SourceExaminationName=source_exam_name,
-                 SourceRoiNames=list(self.ROI_Names),
+                 SourceRoiNames=list(self._roi_names_list),
                  #  Rest are default options
                  SourcePoiNames=[],
                  AssociateStructuresByName=True,
@@ -390,10 +443,16 @@ class CouchTop(object):
                                   icase=icase,
                                   replace=True)
 
-    def update(self, structure_set):
-        rois = {roi.OfRoi.Name for roi in structure_set.RoiGeometries}
+    def update(self, structure_set, roi_names=None):
+        """
+        Pull the geometries for this top from structure_set.  roi_names may be
+        passed as the names of all ROIs in structure_set when the caller has
+        already collected them.
+        """
+        rois = (roi_names if roi_names is not None
+                else {roi.OfRoi.Name for roi in structure_set.RoiGeometries})
         self.roi_geometries = {roi_name: structure_set.RoiGeometries[roi_name]
-                               for roi_name in self.ROI_Names
+                               for roi_name in self._roi_names_list
                                if roi_name in rois}
 
     @classmethod
@@ -405,140 +464,150 @@ class CouchTop(object):
           based on the positions of the 4 side holes.  This method is preferred
           as CT scans often cut off the top of the board.
         """
-        if cls._board_z and str(img_stack) in cls._board_z:
-            return cls._board_z[str(img_stack)]
+        key = str(img_stack)
+        cached = (cls._board_z or {}).get(key)
+        if cached is not None:
+            return cached
 
         z = img_stack.Corner.z + max(img_stack.SlicePositions)
 
         search_y = couch_y + HN_SEARCH_DELTA
-        if simple_search:
-            try:
-                search_point = point(y=search_y)
-                found_point = find_first_edge(img_stack,
-                                              search_start=search_point,
-                                              line_direction='-z',
-                                              rising_edge=True)
-                _logger.debug(f"Found start of board at {found_point}.")
-                if found_point:
-                    # Naively assume that the first point is the start of the
-                    # board
-                    z = found_point.z
-            except Exception as e:
-                _logger.warning(str(e), exc_info=True)
-                return None
-        else:
-            try:
-                # Ignore the central hole and look instead for the side holes.
-
-                # To start, get a guess at the first hole, then find the center
-                # of the H&N Board in the X direction.  We will then move the
-                # search points based on any shift in this image.
-
-                init_guess = point(x=HN_H2_X, y=search_y)
-                guess_edges = find_edges(img_stack, search_start=init_guess,
-                                         line_direction='-z', z_avg=0.05)
-                guess_hole = holes_by_width(edges=guess_edges,
-                                            width=HN_H_DIAM,
-                                            tolerance=1.)[-1]
-
-                width_search = point(y=search_y, z=guess_hole.center.z)
-                width_edges = find_edges(img_stack, search_start=width_search,
-                                         line_direction='x')
-                x_offset = (width_edges[-1][1].x + width_edges[0][0].x)/2
-
-                tp_search_start = point(x=HN_H2_X + x_offset, y=search_y)
-                tn_search_start = point(x=-HN_H2_X + x_offset, y=search_y)
-
-                bp_search_start = point(x=HN_H3_X + x_offset, y=search_y)
-                bn_search_start = point(x=-HN_H3_X + x_offset, y=search_y)
-
-                # Logic will now start with each rising edge in tp_search and
-                # look for a falling edge that is the right distance away
-                # (HN_H_DIAM +- some margin)  If that works, it will try to
-                # find corresponding points that are within the sensible
-                # distances for each other hole.
-                tp_edges = find_edges(img_stack, search_start=tp_search_start,
-                                      line_direction='-z', z_avg=0.05)
-                tn_edges = find_edges(img_stack, search_start=tn_search_start,
-                                      line_direction='-z', z_avg=0.05)
-                bp_edges = find_edges(img_stack, search_start=bp_search_start,
-                                      line_direction='-z', z_avg=0.05)
-                bn_edges = find_edges(img_stack, search_start=bn_search_start,
-                                      line_direction='-z', z_avg=0.05)
-
-                tp_holes = holes_by_width(edges=tp_edges,
-                                          width=HN_H_DIAM,
-                                          tolerance=1.)
-                tn_holes = holes_by_width(edges=tn_edges,
-                                          width=HN_H_DIAM,
-                                          tolerance=1.)
-                bp_holes = holes_by_width(edges=bp_edges,
-                                          width=HN_H_DIAM,
-                                          tolerance=1.)
-                bn_holes = holes_by_width(edges=bn_edges,
-                                          width=HN_H_DIAM,
-                                          tolerance=1.)
-
-                agz = attrgetter('z')
-
-                tp_holes_s = sorted(tp_holes, key=agz, reverse=True)
-                tn_holes_s = sorted(tn_holes, key=agz, reverse=True)
-                bp_holes_s = sorted(bp_holes, key=agz, reverse=True)
-                bn_holes_s = sorted(bn_holes, key=agz, reverse=True)
-
-                tp_hole_z = tp_holes_s[0].z
-                tn_hole_z = tn_holes_s[0].z
-
-                top_hole_z = (tp_hole_z + tn_hole_z) / 2
-
-                bp_hole_z = [h.z for h in bp_holes_s
-                             if h.z < top_hole_z - (2 * HN_H_DIAM)][0]
-                bn_hole_z = [h.z for h in bn_holes_s
-                             if h.z < top_hole_z - (2 * HN_H_DIAM)][0]
-
-                bot_hole_z = (bp_hole_z + bn_hole_z) / 2
-
-                if _logger.level <= logging.DEBUG:
-                    global __DEBUG__TB__
-                    __DEBUG__TB__ = locals()
-
-                # Check a few features to make sure that the holes are sensible
-                if ((abs(bn_hole_z - bp_hole_z) > HN_H_DIAM / 2
-                     or abs(tn_hole_z - tp_hole_z) > HN_H_DIAM / 2)):
-                    # Holes aren't aligned with eachother, not the same holes
-                    # or the board is way to rotated, fail out.
-                    _logger.warning(f"Holes not aligned: "
-                                   f"{tn_hole_z}, {tp_hole_z}, "
-                                   f"{bn_hole_z}, {bp_hole_z}")
-                    return None
-
-                if abs(abs(top_hole_z - bot_hole_z) - HN_H_SEP) > HN_H_DIAM:
-                    # Holes aren't spaced right, no further checking yet
-                    # TODO: Possibly look for additional hole pairs that do
-                    # match.
-                    _logger.warning(f"Holes not spaced correctly:"
-                                   f" {top_hole_z}, {bot_hole_z}")
-                    return None
-
-                # Finally, these look right so return the location of the top
-                # of the board from these holes.  Include the distance from
-                # hole center of the top hole to the edge of the board.
-                _logger.debug("Holes for distance: "
-                             f"{tn_hole_z}, {tp_hole_z}, "
-                             f"{bn_hole_z}, {bp_hole_z}")
-
-                z = (((top_hole_z + bot_hole_z + HN_H_SEP) / 2)
-                     + HN_H1_TO_H2_Z + HN_H1_TO_BOARD_Z)
-            except IndexError:
-                pass
+        search = cls._simple_board_z if simple_search else cls._complex_board_z
+        z = search(img_stack, search_y, z)
+        if z is None:
+            return None
 
         # MAGIC: Store the search result in the class so we don't have to do it
         # again.
         if not cls._board_z:
-            cls._board_z = {str(img_stack): z}
+            cls._board_z = {key: z}
         else:
-            cls._board_z[str(img_stack)] = z
+            cls._board_z[key] = z
+
+        return z
+
+    @staticmethod
+    def _simple_board_z(img_stack, search_y, z):
+        """
+        Board z from the first edge along the central hole line.  Returns z
+          unchanged if no edge is found, or None if the search failed.
+        """
+        try:
+            search_point = point(y=search_y)
+            found_point = find_first_edge(img_stack,
+                                          search_start=search_point,
+                                          line_direction='-z',
+                                          rising_edge=True)
+            _logger.debug("Found start of board at %s.", found_point)
+            if found_point:
+                # Naively assume that the first point is the start of the
+                # board
+                z = found_point.z
+        except Exception as e:
+            _logger.warning(str(e), exc_info=True)
+            return None
+        return z
+
+    @staticmethod
+    def _complex_board_z(img_stack, search_y, z):
+        """
+        Board z from the four side holes.  Returns z unchanged if the holes
+          can't be found, or None if the holes found don't look like the
+          board.
+        """
+        try:
+            # Ignore the central hole and look instead for the side holes.
+
+            # To start, get a guess at the first hole, then find the center
+            # of the H&N Board in the X direction.  We will then move the
+            # search points based on any shift in this image.
+
+            init_guess = point(x=HN_H2_X, y=search_y)
+            guess_edges = find_edges(img_stack, search_start=init_guess,
+                                     line_direction='-z', z_avg=0.05)
+            guess_hole = holes_by_width(edges=guess_edges,
+                                        width=HN_H_DIAM,
+                                        tolerance=1.)[-1]
+
+            width_search = point(y=search_y, z=guess_hole.center.z)
+            width_edges = find_edges(img_stack, search_start=width_search,
+                                     line_direction='x')
+            x_offset = (width_edges[-1][1].x + width_edges[0][0].x)/2
+
+            side_search_starts = [point(x=hole_x + x_offset, y=search_y)
+                                  for hole_x in HN_SIDE_HOLES_X]
+
+            # Logic will now start with each rising edge in tp_search and
+            # look for a falling edge that is the right distance away
+            # (HN_H_DIAM +- some margin)  If that works, it will try to
+            # find corresponding points that are within the sensible
+            # distances for each other hole.  All four lines are sampled
+            # in a single call.
+            side_edges = find_edges_multi(img_stack, side_search_starts,
+                                          line_direction='-z', z_avg=0.05)
+
+            tp_holes, tn_holes, bp_holes, bn_holes = [
+                holes_by_width(edges=edges, width=HN_H_DIAM, tolerance=1.)
+                for edges in side_edges]
+
+            # Only the highest hole (in z) on each side is needed, so
+            # take the max rather than sorting every candidate.
+            agz = attrgetter('z')
+
+            tp_hole = max(tp_holes, key=agz, default=None)
+            tn_hole = max(tn_holes, key=agz, default=None)
+            if tp_hole is None or tn_hole is None:
+                # No top side holes found, fall back to the default.
+                return z
+
+            tp_hole_z = tp_hole.z
+            tn_hole_z = tn_hole.z
+
+            top_hole_z = (tp_hole_z + tn_hole_z) / 2
+
+            bot_max_z = top_hole_z - (2 * HN_H_DIAM)
+            bp_hole_z = max((h.z for h in bp_holes if h.z < bot_max_z),
+                            default=None)
+            bn_hole_z = max((h.z for h in bn_holes if h.z < bot_max_z),
+                            default=None)
+            if bp_hole_z is None or bn_hole_z is None:
+                # No bottom side holes found, fall back to the default.
+                return z
+
+            bot_hole_z = (bp_hole_z + bn_hole_z) / 2
+
+            if _logger.level <= logging.DEBUG:
+                global __DEBUG__TB__
+                __DEBUG__TB__ = locals()
+
+            # Check a few features to make sure that the holes are sensible
+            if ((abs(bn_hole_z - bp_hole_z) > HN_H_DIAM / 2
+                 or abs(tn_hole_z - tp_hole_z) > HN_H_DIAM / 2)):
+                # Holes aren't aligned with eachother, not the same holes
+                # or the board is way to rotated, fail out.
+                _logger.warning(f"Holes not aligned: "
+                               f"{tn_hole_z}, {tp_hole_z}, "
+                               f"{bn_hole_z}, {bp_hole_z}")
+                return None
 
+            if abs(abs(top_hole_z - bot_hole_z) - HN_H_SEP) > HN_H_DIAM:
+                # Holes aren't spaced right, no further checking yet
+                # TODO: Possibly look for additional hole pairs that do
+                # match.
+                _logger.warning(f"Holes not spaced correctly:"
+                               f" {top_hole_z}, {bot_hole_z}")
+                return None
+
+            # Finally, these look right so return the location of the top
+            # of the board from these holes.  Include the distance from
+            # hole center of the top hole to the edge of the board.
+            _logger.debug("Holes for distance: %s, %s, %s, %s",
+                          tn_hole_z, tp_hole_z, bn_hole_z, bp_hole_z)
+
+            z = (((top_hole_z + bot_hole_z + HN_H_SEP) / 2)
+                 + HN_H1_TO_H2_Z + HN_H1_TO_BOARD_Z)
+        except IndexError:
+            pass
         return z
 
     def move_rois(self, structure_set, couch_y=CT_Couch_TopY,
@@ -546,8 +615,9 @@ class CouchTop(object):
         examination = structure_set.OnExamination
         img_stack = examination.Series[0].ImageStack
 
-        roi_max_z = max([pt.z for roi in self.ROI_Names
-                         for pt in self.roi_geometries[roi].GetBoundingBox()])
+        # Upper corner of each bounding box holds the max z.
+        roi_max_z = max(self.roi_geometries[roi].GetBoundingBox()[1].z
+                        for roi in self._roi_names_list)
 
         z_top_corner = (img_stack.Corner.z + max(img_stack.SlicePositions))
         if match_z and not forced_z:
@@ -571,10 +641,13 @@ class CouchTop(object):
 
         transform = self.get_transform(structure_set, couch_y, z)
 
-        for roi in self.ROI_Names:
-            structure_set.RoiGeometries[roi].OfRoi.TransformROI3D(
-                Examination=examination,
-                TransformationMatrix=transform)
+        # Geometries were already looked up by update(), reuse them rather
+        # than going back through structure_set for each ROI.
+        rois = [self.roi_geometries[roi].OfRoi
+                for roi in self._roi_names_list]
+        for roi in rois:
+            roi.TransformROI3D(Examination=examination,
+                               TransformationMatrix=transform)
 
     def remove_from_case(self):
         with CompositeAction("Remove {} couch from case.".format(self.Name)):
@@ -623,10 +696,14 @@ class CouchTopCollection(object):
         self._DB_Tops = {tmpl['Name']: tmpl for tmpl
                          in patient_db.GetPatientModelTemplateInfo()}
 
+        # Only load templates that exist in the database, a failed
+        # LoadTemplatePatientModel is just as slow as a successful one.
         if tops:
-            self.Tops = {k: CouchTop(k, **v) for k, v in tops.items()}
+            self.Tops = {k: CouchTop(k, **v) for k, v in tops.items()
+                         if k in self._DB_Tops}
         elif use_known:
-            self.Tops = {k: CouchTop(k, **v) for k, v in KNOWN_TOPS.items()}
+            self.Tops = {k: CouchTop(k, **v) for k, v in KNOWN_TOPS.items()
+                         if k in self._DB_Tops}
         else:
             self.Tops = {k: CouchTop(k) for k in self._DB_Tops}
 
@@ -658,16 +735,18 @@ class CouchTopCollection(object):
     def update(self, patient_db=get_current("PatientDB"), structure_set=None):
         self.HN_Tops = {}
         self.Normal_Tops = {}
-        self._keys = sorted([top for top in self.Tops
-                             if self.Tops[top].isValid])
+        roi_names = (frozenset(roi.OfRoi.Name for roi
+                               in structure_set.RoiGeometries)
+                     if structure_set else None)
         for topname, top in self.Tops.items():
             if top.isValid:
                 if structure_set:
-                    self[topname].update(structure_set)
+                    top.update(structure_set, roi_names)
                 if top.isHN:
                     self.HN_Tops[topname] = top
                 else:
                     self.Normal_Tops[topname] = top
+        self._keys = sorted([*self.HN_Tops, *self.Normal_Tops])
 
     def get_other_machines_tops(self, inTop):
         if isinstance(inTop, str) and inTop in self.Tops:
@@ -678,13 +757,17 @@ class CouchTopCollection(object):
                 not inTop.machine_matches(top)}
 
     def get_tops_in_structure_set(self, structure_set):
-        plan_roi_names = {roi.OfRoi.Name for roi
-                          in structure_set.RoiGeometries}
+        plan_roi_names = frozenset(roi.OfRoi.Name for roi
+                                   in structure_set.RoiGeometries)
         models_present = []
-        for top_name in self:
-            self[top_name].update(structure_set)
-            if set(self[top_name]['ROI_Names']) <= plan_roi_names:
-                models_present.append(self[top_name])
+        for top in self.Tops.values():
+            if not top.isValid:
+                # Template didn't load, its empty ROI_Names would otherwise
+                # count as present in every structure set.
+                continue
+            top.update(structure_set, plan_roi_names)
+            if top.ROI_Names <= plan_roi_names:
+                models_present.append(top)
 
         # If we have any H&N tops in the model, we should only return the
         # subset that are H&N tops. (elminates name collisions for non H&N
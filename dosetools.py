@@ -16,13 +16,34 @@ def invalidate_structureset_doses(icase, structure_set):
 
         for txplan in icase.TreatmentPlans:
             for bs in txplan.BeamSets:
+                # Only touch beam sets with dose on this exam, and fetch the
+                # density once since each access goes back to RayStation.
                 fd = bs.FractionDose
-                if (fd.OnDensity
-                        and fd.OnDensity.FromExamination.Name == exam_name):
-                    grid = bs.GetDoseGrid()
-                    bs.UpdateDoseGrid(Corner=grid.Corner,
-                                      VoxelSize=grid.VoxelSize,
-                                      NumberOfVoxels={'x': 1, 'y': 1, 'z': 1})
-                    bs.UpdateDoseGrid(Corner=grid.Corner,
-                                      VoxelSize=grid.VoxelSize,
-                                      NumberOfVoxels=grid.NrVoxels)
+                density = fd.OnDensity
+                if not density or density.FromExamination.Name != exam_name:
+                    continue
+
+                # No computed dose means nothing to invalidate, skip the two
+                # grid updates.
+                if fd.DoseValues is None:
+                    continue
+
+                _invalidate_bs_dose(bs)
+
+
+def _invalidate_bs_dose(bs):
+    """
+    Shrink the dose grid of bs to a single slice and restore it, which drops
+    any computed dose.
+    """
+    grid = bs.GetDoseGrid()
+    # Read the grid geometry once, both updates use the same values.
+    corner = grid.Corner
+    voxel_size = grid.VoxelSize
+    nr_voxels = grid.NrVoxels
+    bs.UpdateDoseGrid(Corner=corner,
+                      VoxelSize=voxel_size,
+                      NumberOfVoxels={'x': 1, 'y': 1, 'z': 1})
+    bs.UpdateDoseGrid(Corner=corner,
+                      VoxelSize=voxel_size,
+                      NumberOfVoxels=nr_voxels)
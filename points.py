@@ -209,7 +209,8 @@ class Hole(object):
         return self.center.z
 
 
-def find_fwhm_edges(inarray, threshold='global_half_max', min_value=None):
+def find_fwhm_edges(inarray, threshold='global_half_max', min_value=None,
+                    max_pairs=None):
     min_value = min_value if min_value is not None else min(inarray)
     last_max = min_value
     last_i = 0
@@ -232,8 +233,12 @@ def find_fwhm_edges(inarray, threshold='global_half_max', min_value=None):
 
                 if v <= edge_v:
                     indices.append((last_i, i))
-                    _logger.debug(f"Adding ({last_i}, {i}) to list.")
+                    _logger.debug("Adding (%d, %d) to list.", last_i, i)
                     last_i = 0
+                    if max_pairs and len(indices) >= max_pairs:
+                        # Caller only wants the first few edges, stop here
+                        # rather than walking the rest of the line.
+                        break
                     """
                     indices.append(i + (indices[-2] if len(indices) > 2
                 else 0))
@@ -254,7 +259,23 @@ def find_fwhm_edges(inarray, threshold='global_half_max', min_value=None):
 
 
 def find_edges(img_stack, search_start=None, x_avg=None, y_avg=None,
-               z_avg=None, line_direction='-y', threshold=-600):
+               z_avg=None, line_direction='-y', threshold=-600,
+               max_pairs=None):
+    edges = find_edges_multi(img_stack, [search_start], x_avg=x_avg,
+                             y_avg=y_avg, z_avg=z_avg,
+                             line_direction=line_direction,
+                             threshold=threshold, max_pairs=max_pairs)
+    return edges[0] if edges else None
+
+
+def find_edges_multi(img_stack, search_starts, x_avg=None, y_avg=None,
+                     z_avg=None, line_direction='-y', threshold=-600,
+                     max_pairs=None):
+    """
+    Same as find_edges, but searches one line for each of search_starts with a
+    single ResampleImageDataOnGrids call.  Returns a list with the edge pairs
+    (or None if no edges were found) for each search start.
+    """
     line_invert = '-' in line_direction
     ldir = line_direction[-1] if line_direction[-1] in ('x', 'y', 'z') else 'y'
     lvec = point({ldir: 1})
@@ -289,66 +310,79 @@ def find_edges(img_stack, search_start=None, x_avg=None, y_avg=None,
 
     voxelcount = (((size//resolution) - 1) * lvec) + 1
 
-    # Build a point out of the search start, and any coordinate which is None
-    # should be set to the image_center for that coordinate.
-    search_pt = point({idx: (v if v is not None
-                             else image_center[idx])
-                       for idx, v in point(search_start).items()})
-    search_pt.to_from_rs()
-
-    # If search_start was not set, this will start the search from the image
-    # center in all directions except the search direction where it will start
-    # at the corner.  Otherwise, if search_start has any points defined (x y or
-    # z) it will use those points (except it will also start from the corner
-    # for the search direction).
-    corner = (point(img_stack.Corner) * lvec) + (search_pt * ~lvec)
-
-    corner.to_from_rs()
-
-    _logger.debug(f"ires:\t{img_res}\n"
-                 f"np:\t{n_pixels}\n"
-                 f"size:\t{size}\n"
-                 f"res:\t{resolution}\n"
-                 f"vc:\t{voxelcount}")
+    corners = []
+    for search_start in search_starts:
+        # Build a point out of the search start, and any coordinate which is
+        # None should be set to the image_center for that coordinate.
+        search_pt = point({idx: (v if v is not None
+                                 else image_center[idx])
+                           for idx, v in point(search_start).items()})
+        search_pt.to_from_rs()
+
+        # If search_start was not set, this will start the search from the
+        # image center in all directions except the search direction where it
+        # will start at the corner.  Otherwise, if search_start has any points
+        # defined (x y or z) it will use those points (except it will also
+        # start from the corner for the search direction).
+        corner = (point(img_stack.Corner) * lvec) + (search_pt * ~lvec)
+
+        corner.to_from_rs()
+        corners.append(corner)
+
+    if not corners:
+        return []
+
+    _logger.debug("ires:\t%s\n"
+                  "np:\t%s\n"
+                  "size:\t%s\n"
+                  "res:\t%s\n"
+                  "vc:\t%s", img_res, n_pixels, size, resolution, voxelcount)
 
     voxelsizes = resolution
 
-    _logger.debug(f"{voxelcount} {voxelsizes} {corner}")
+    _logger.debug("%s %s %s", voxelcount, voxelsizes, corners)
 
     try:
-        line_pos = [corner[ldir] + pt * resolution[ldir]
+        # All corners share the same start along the search direction.
+        line_pos = [corners[0][ldir] + pt * resolution[ldir]
                     for pt in range(voxelcount[ldir])]
-        lines = img_stack.ResampleImageDataOnGrids(NrVoxelsVec=[voxelcount],
-                                                   VoxelSizesVec=[voxelsizes],
-                                                   CornerVec=[corner])
-        line = list(lines[0])
+        n_lines = len(corners)
+        lines = img_stack.ResampleImageDataOnGrids(
+            NrVoxelsVec=[voxelcount] * n_lines,
+            VoxelSizesVec=[voxelsizes] * n_lines,
+            CornerVec=corners)
         if line_invert:
             line_pos = line_pos[::-1]
-            line = line[::-1]
 
-        edge_pairs = find_fwhm_edges(line, threshold)
+        _logger.debug("line_pos = %r", line_pos)
+        _logger.debug("lvec = %r", lvec)
+
+        all_edges = []
+        for corner, line in zip(corners, lines):
+            line = list(line)
+            if line_invert:
+                line = line[::-1]
+
+            edge_pairs = find_fwhm_edges(line, threshold, max_pairs=max_pairs)
 
-        _logger.debug(f"{edge_pairs = }")
-        _logger.debug(f"{line_pos = }")
-        _logger.debug(f"{lvec = }")
+            _logger.debug("edge_pairs = %r", edge_pairs)
 
-        if not edge_pairs:
-            # If we never found a good edge, the couch edge must be outside of
-            # the FOV.  Return None
-            return None
+            if not edge_pairs:
+                # If we never found a good edge, the couch edge must be
+                # outside of the FOV.
+                all_edges.append(None)
+                continue
 
-        # Return a list of paired edges in raystation coordinates.
-        edge_pairs_rs = [(((line_pos[pair[0]] * lvec)
-                           + (corner * ~lvec)).to_from_rs(),
-                          ((line_pos[pair[1]] * lvec)
-                           + (corner * ~lvec)).to_from_rs())
-                         for pair in edge_pairs]
-        _logger.debug(f"{edge_pairs_rs = }")
-        return edge_pairs_rs
+            # List of paired edges in raystation coordinates.
+            edge_pairs_rs = [(((line_pos[pair[0]] * lvec)
+                               + (corner * ~lvec)).to_from_rs(),
+                              ((line_pos[pair[1]] * lvec)
+                               + (corner * ~lvec)).to_from_rs())
+                             for pair in edge_pairs]
+            _logger.debug("edge_pairs_rs = %r", edge_pairs_rs)
+            all_edges.append(edge_pairs_rs)
 
-        # Return a simlpe list of edges in raystation coordinates.
-        return [((line_pos[x] * lvec)
-                 + (corner * ~lvec)).to_from_rs() for x in edge_pairs]
+        return all_edges
 
     except (TypeError, ValueError, IndexError, SystemError) as e:
         _logger.exception(e)
@@ -361,7 +395,7 @@ def find_first_edge(img_stack, search_start=None,
     kwargs = {k: v for k, v in locals().items() if v is not None}
     del kwargs['img_stack']
     del kwargs['rising_edge']
-    return find_edges(img_stack, **kwargs)[0][not rising_edge]
+    return find_edges(img_stack, max_pairs=1, **kwargs)[0][not rising_edge]
 
 
 def holes_by_width(edges: Sequence[Tuple[point, point]],
@@ -381,12 +415,12 @@ def holes_by_width(edges: Sequence[Tuple[point, point]],
     for i, pair_i in enumerate(edges):
         # Loop through all falling edge points after i
         for pair_next in edges[i:]:
-            _logger.debug(f"On index {i} {pair_i!s} looking at {pair_next!s}")
+            _logger.debug("On index %d %s looking at %s", i, pair_i, pair_next)
             center = (pair_i[0] + pair_next[1])/2.
-            _logger.debug(f"On index {i} {pair_i[0]!s} to "
-                         f"{pair_next[1]!s} center {center!s}")
+            _logger.debug("On index %d %s to %s center %s",
+                          i, pair_i[0], pair_next[1], center)
             dist = (pair_i[0] - pair_next[1]).magnitude
-            _logger.debug(f"Point distance is {dist:.2f}")
+            _logger.debug("Point distance is %.2f", dist)
             if abs(dist - width) <= tolerance:
                 edge_pair_centers.append(Hole(center, dist))
 
@@ -1,6 +1,7 @@
 from struct import unpack, calcsize
 from gzip import open as gzopen, GzipFile
 from io import BytesIO, SEEK_CUR
+from collections import OrderedDict
 import logging
 
 # PyDICOM read (might not be present)
@@ -9,6 +10,11 @@ from .external import dcmread
 
 _logger = logging.getLogger(__name__)
 
+# Recently read datasets keyed by (str(img_stack), dcm_number).  Image stacks
+# don't change during a session, so there is no need to unpack them again.
+_DATASET_CACHE = OrderedDict()
+_DATASET_CACHE_SIZE = 8
+
 # Dicom data store in RS is in a gzipped format with multiple files stuck
 # together.  There are some (seemingly) standard headers for the file data, and
 # the format is contructed from what could be assessed.
@@ -44,7 +50,7 @@ class DCM_IO(GzipFile):
     def unpack_read(self, pack_str):
         pack_str = f"={pack_str}"
         n_bytes = calcsize(pack_str)
-        _logger.debug(f"Reading '{pack_str}' ({n_bytes} bytes)")
+        _logger.debug("Reading '%s' (%d bytes)", pack_str, n_bytes)
         return unpack(pack_str, self.read(n_bytes))
 
     def unpack_readrepeat(self, pack_str, count):
@@ -56,18 +62,35 @@ def read_dataset(img_stack, dcm_number=0):
     """
     Read the DicomDataSet from the img_stack and returns a pydicom object
     containing the non-pixel data for image number <img_number>.
+    Results are cached for the most recently read image stacks.
     """
+    key = (str(img_stack), dcm_number)
+    if key in _DATASET_CACHE:
+        _DATASET_CACHE.move_to_end(key)
+        return list(_DATASET_CACHE[key])
+
+    dicoms = _read_dataset(img_stack, dcm_number)
+    if dicoms is None:
+        return None
+
+    _DATASET_CACHE[key] = dicoms
+    if len(_DATASET_CACHE) > _DATASET_CACHE_SIZE:
+        _DATASET_CACHE.popitem(last=False)
+    return list(dicoms)
+
+
+def _read_dataset(img_stack, dcm_number):
     # TODO: Allow to search by SOP Instance UID
     try:
         dicoms = []
         with DCM_IO(gzopen(BytesIO(img_stack.DicomDataSet), 'rb')) as dcm_io:
             # Skip first 27 bytes of header (no idea what they are)
             header_bytes = dcm_io.read(27)
-            _logger.debug(f"Header from DicomDataSet: {header_bytes!r}")
+            _logger.debug("Header from DicomDataSet: %r", header_bytes)
 
             # FIXME: Should we check ohseven and ohtwo?
             n_dcms, ohseven, ohtwo = dcm_io.unpack_read("Lbb")
-            _logger.debug(f"{n_dcms = }")
+            _logger.debug("n_dcms = %r", n_dcms)
 
             # Probably ignore this too?
             dcm_listing = dcm_io.unpack_readrepeat("bL", n_dcms)
@@ -89,7 +112,7 @@ def read_dataset(img_stack, dcm_number=0):
                 # MAGIC: Works if dcm_number is negative to capture all images.
                 if dcm_number - i <= 0:
                     dcm_bytes = BytesIO(dcm_io.read(dcm_size))
-                    dcm = dcmread(dcm_bytes)
+                    dcm = dcmread(dcm_bytes, stop_before_pixels=True)
                     dicoms.append(dcm)
                 else:
                     dcm_io.seek(dcm_size, SEEK_CUR)